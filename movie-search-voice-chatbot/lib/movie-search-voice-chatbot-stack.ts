@@ -21,6 +21,10 @@ import * as elbv2targets from 'aws-cdk-lib/aws-elasticloadbalancingv2-targets';
 import * as alb_actions from 'aws-cdk-lib/aws-elasticloadbalancingv2-actions';
 import * as cognito from 'aws-cdk-lib/aws-cognito';
 import * as opensearch from 'aws-cdk-lib/aws-opensearchservice';
+import * as s3 from 'aws-cdk-lib/aws-s3';
+import * as s3deploy from 'aws-cdk-lib/aws-s3-deployment';
+import * as cloudfront from 'aws-cdk-lib/aws-cloudfront';
+import * as origins from 'aws-cdk-lib/aws-cloudfront-origins';
 import { NagSuppressions } from 'cdk-nag';
 
 /**
@@ -36,6 +40,7 @@ import { NagSuppressions } from 'cdk-nag';
  * - OpenSearch Lambda function and REST API
  * - Utterance processing Lambda with Bedrock integration
  * - Web interface Lambda function
+ * - S3 bucket and CloudFront distribution for static web assets
  * - Cognito user pool and authentication
  *
  * Key components:
@@ -59,6 +64,8 @@ import { NagSuppressions } from 'cdk-nag';
  * - BEDROCK_STREAM_TEMPERATURE: Temperature parameter for Bedrock
  * - BEDROCK_TOP_P: Top P parameter for Bedrock
  * - MOVIE_DATABASE_URL: OpenSearch API endpoint
+ * - ASSETS_URL: CloudFront distribution URL for static web assets
+ * - LOG_LEVEL: WebSocket handler log level, DEBUG logs every websocket event
  */
 
 interface MovieSearchVoiceChatbotStackProps extends cdk.StackProps {
@@ -161,6 +168,26 @@ export class MovieSearchVoiceChatbotStack extends cdk.Stack {
       {
         id: 'AwsSolutions-COG3',
         reason: 'Advanced security mode not required for development environment'
+      },
+      {
+        id: 'AwsSolutions-S1',
+        reason: 'Server access logs not required for static web assets bucket'
+      },
+      {
+        id: 'AwsSolutions-CFR1',
+        reason: 'Geo restrictions not required for static web assets'
+      },
+      {
+        id: 'AwsSolutions-CFR2',
+        reason: 'WAF not required for development environment'
+      },
+      {
+        id: 'AwsSolutions-CFR3',
+        reason: 'Access logging not required for development environment'
+      },
+      {
+        id: 'AwsSolutions-CFR4',
+        reason: 'Default CloudFront certificate is used for the static web assets distribution'
       }
     ]);
 
@@ -293,13 +320,8 @@ export class MovieSearchVoiceChatbotStack extends cdk.Stack {
       })
     );
 
-    /** CloudWatch metrics permissions for WebSocket handler */
-    websocketHandlerRole.addToPolicy(
-      new iam.PolicyStatement({
-        actions: ['cloudwatch:PutMetricData'],
-        resources: ['*'],
-      })
-    );
+    /** WebSocket handler log level, set to DEBUG to log every websocket event */
+    const websocketHandlerLogLevel = 'INFO';
 
     /** WebSocket handler Lambda function */
     const websocketHandler = new lambda.Function(this, 'websocketHandler', {
@@ -310,8 +332,12 @@ export class MovieSearchVoiceChatbotStack extends cdk.Stack {
             'bash',
             '-c',
             [
-              'pip install -r websocket-handler-lambda/requirements.txt -t /asset-output',
+              // Lambda runs on ARM64, so fetch aarch64 wheels for compiled dependencies
+              'pip install -r websocket-handler-lambda/requirements.txt -t /asset-output --platform manylinux2014_aarch64 --only-binary=:all:',
               'cp websocket-handler-lambda/* /asset-output',
+              // /var/task is read only, so ship bytecode rather than compile on every cold start.
+              // Hash based pycs stay valid although the asset zip does not keep file mtimes
+              'python -m compileall -q --invalidation-mode unchecked-hash /asset-output',
             ].join(' && '),
           ],
         },
@@ -321,7 +347,9 @@ export class MovieSearchVoiceChatbotStack extends cdk.Stack {
       architecture: lambda.Architecture.ARM_64,
       role: websocketHandlerRole,
       logRetention: logs.RetentionDays.ONE_DAY,
-      environment: {},
+      environment: {
+        LOG_LEVEL: websocketHandlerLogLevel,
+      },
       timeout: cdk.Duration.seconds(60),
     });
 
@@ -415,6 +443,8 @@ export class MovieSearchVoiceChatbotStack extends cdk.Stack {
                 WEBSOCKET_URL: webSocketStageDev.callbackUrl,
                 DYNAMODB_TABLE: websocketTable.tableName,
                 UTTERANCE_QUEUE_FIFO_URL: utteranceQueueFifo.queueUrl,
+                // The update replaces the whole environment, so carry LOG_LEVEL over
+                LOG_LEVEL: websocketHandlerLogLevel,
               },
             },
           },
@@ -430,6 +460,8 @@ export class MovieSearchVoiceChatbotStack extends cdk.Stack {
                 WEBSOCKET_URL: webSocketStageDev.callbackUrl,
                 DYNAMODB_TABLE: websocketTable.tableName,
                 UTTERANCE_QUEUE_FIFO_URL: utteranceQueueFifo.queueUrl,
+                // The update replaces the whole environment, so carry LOG_LEVEL over
+                LOG_LEVEL: websocketHandlerLogLevel,
               },
             },
           },
@@ -508,7 +540,8 @@ export class MovieSearchVoiceChatbotStack extends cdk.Stack {
             'bash',
             '-c',
             [
-              'pip install -r movie-database-handler-lambda/requirements.txt -t /asset-output',
+              // Lambda runs on ARM64, so fetch aarch64 wheels for compiled dependencies
+              'pip install -r movie-database-handler-lambda/requirements.txt -t /asset-output --platform manylinux2014_aarch64 --only-binary=:all:',
               'cp movie-database-handler-lambda/* /asset-output',
             ].join(' && '),
           ],
@@ -626,7 +659,8 @@ export class MovieSearchVoiceChatbotStack extends cdk.Stack {
             'bash',
             '-c',
             [
-              'pip install -r utterance-handler-lambda/requirements.txt -t /asset-output',
+              // Lambda runs on ARM64, so fetch aarch64 wheels for compiled dependencies
+              'pip install -r utterance-handler-lambda/requirements.txt -t /asset-output --platform manylinux2014_aarch64 --only-binary=:all:',
               'cp utterance-handler-lambda/* /asset-output',
             ].join(' && '),
           ],
@@ -652,8 +686,15 @@ export class MovieSearchVoiceChatbotStack extends cdk.Stack {
       ephemeralStorageSize: cdk.Size.mebibytes(1024),
     });
 
+    /** Utterance handler alias with provisioned concurrency to avoid cold starts */
+    const utteranceHandlerAlias = new lambda.Alias(this, 'utteranceHandlerAlias', {
+      aliasName: 'live',
+      version: utteranceHandler.currentVersion,
+      provisionedConcurrentExecutions: 2,
+    });
+
     /** SQS event source for utterance handler */
-    utteranceHandler.addEventSource(
+    utteranceHandlerAlias.addEventSource(
       new eventsources.SqsEventSource(utteranceQueueFifo, {
         batchSize: 1,
         maxConcurrency: 10,
@@ -696,6 +737,67 @@ export class MovieSearchVoiceChatbotStack extends cdk.Stack {
       })
     );
 
+    /** S3 bucket for static web assets */
+    const assetsBucket = new s3.Bucket(this, 'assetsBucket', {
+      blockPublicAccess: s3.BlockPublicAccess.BLOCK_ALL,
+      encryption: s3.BucketEncryption.S3_MANAGED,
+      enforceSSL: true,
+      removalPolicy: cdk.RemovalPolicy.DESTROY,
+      autoDeleteObjects: true,
+    });
+
+    /** CloudFront distribution for static web assets */
+    const assetsDistribution = new cloudfront.Distribution(
+      this,
+      'assetsDistribution',
+      {
+        defaultBehavior: {
+          origin: origins.S3BucketOrigin.withOriginAccessControl(assetsBucket),
+          viewerProtocolPolicy: cloudfront.ViewerProtocolPolicy.REDIRECT_TO_HTTPS,
+          cachePolicy: cloudfront.CachePolicy.CACHING_OPTIMIZED,
+          responseHeadersPolicy:
+            cloudfront.ResponseHeadersPolicy.CORS_ALLOW_ALL_ORIGINS,
+        },
+        minimumProtocolVersion: cloudfront.SecurityPolicyProtocol.TLS_V1_2_2021,
+      }
+    );
+
+    /** Static web assets deployment */
+    new s3deploy.BucketDeployment(this, 'assetsDeployment', {
+      sources: [
+        s3deploy.Source.asset(
+          path.join(__dirname, '../src/interface-handler-lambda'),
+          {
+            bundling: {
+              image: lambda.Runtime.NODEJS_18_X.bundlingImage,
+              command: [
+                'bash',
+                '-c',
+                [
+                  // Install browserify and dependencies
+                  'npm install -g browserify',
+
+                  // Install npm dependencies
+                  'npm install',
+
+                  // Run browserify
+                  'browserify lib/javascript.js -o assets/js/javascript.js -d',
+
+                  // Copy static assets
+                  'mkdir /asset-output/assets',
+                  'cp -r assets/* /asset-output/assets',
+                ].join(' && '),
+              ],
+              user: 'root', // This ensures we have the right permissions
+            },
+          }
+        ),
+      ],
+      destinationBucket: assetsBucket,
+      distribution: assetsDistribution,
+      distributionPaths: ['/assets/*'],
+    });
+
     /** Interface handler Lambda function */
     const interfaceHandler = new lambda.Function(this, 'interfaceHandler', {
       code: lambda.Code.fromAsset(path.join(__dirname, '../src'), {
@@ -705,30 +807,13 @@ export class MovieSearchVoiceChatbotStack extends cdk.Stack {
             'bash',
             '-c',
             [
-              // Install Node.js and npm
-              'curl -fsSL https://rpm.nodesource.com/setup_18.x | bash -',
-              'dnf install -y nodejs',
-
-              // Install browserify and dependencies
-              'npm install -g browserify',
-
-              // Install npm dependencies
               'cd interface-handler-lambda',
-              'npm install',
-
-              // Run browserify
-              'browserify lib/javascript.js -o assets/js/javascript.js -d',
-
-              // Install Python dependencies
               'pip install -r requirements.txt -t /asset-output',
               'cp *.py /asset-output',
-              'mkdir /asset-output/assets',
-              'cp -r assets/* /asset-output/assets',
               'mkdir /asset-output/html',
               'cp html/* /asset-output/html',
             ].join(' && '),
           ],
-          user: 'root', // This ensures we have the right permissions
         },
       }),
       handler: 'interface_handler.lambda_handler',
@@ -739,16 +824,24 @@ export class MovieSearchVoiceChatbotStack extends cdk.Stack {
       environment: {
         WEBSOCKET_URL: webSocketStageDev.callbackUrl,
         DYNAMODB_TABLE: websocketTable.tableName,
+        ASSETS_URL: `https://${assetsDistribution.distributionDomainName}`,
       },
       timeout: cdk.Duration.seconds(30),
     });
 
+    /** Interface handler alias with provisioned concurrency to avoid cold starts */
+    const interfaceHandlerAlias = new lambda.Alias(this, 'interfaceHandlerAlias', {
+      aliasName: 'live',
+      version: interfaceHandler.currentVersion,
+      provisionedConcurrentExecutions: 2,
+    });
+
     /** Target group for load balancer */
     const loadBalancerTargetGroup = new elbv2.ApplicationTargetGroup(
       this,
       'loadBalancerTargetGroup',
       {
-        targets: [new elbv2targets.LambdaTarget(interfaceHandler)],
+        targets: [new elbv2targets.LambdaTarget(interfaceHandlerAlias)],
         healthCheck: {
           enabled: false,
         },
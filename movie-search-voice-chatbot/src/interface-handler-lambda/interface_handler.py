@@ -1,16 +1,19 @@
 """
-Lambda function handler module for processing HTTP requests and serving web assets.
-Handles authentication via JWT and serves various file types including HTML, CSS, JS, PNG and WAV.
+Lambda function handler module for processing HTTP requests and serving the web interface.
+Handles authentication via JWT and serves the HTML shell, which references static assets
+(CSS, JS, PNG and WAV) hosted on Amazon S3 behind Amazon CloudFront.
 Also provides functionality for generating WebSocket URLs and managing scenario data.
 """
 
 import base64
 import json
 import os
+from typing import Tuple
 from sigv4_presigned_url import generate_apigateway_presigned_url
 
 
 AWS_REGION = os.environ['AWS_REGION']
+ASSETS_URL = os.environ['ASSETS_URL']
 
 
 def get_jwt_payload(jwt: str) -> dict:
@@ -24,11 +27,17 @@ def get_jwt_payload(jwt: str) -> dict:
         dict: The decoded JWT payload as a dictionary
     """
     payload = {}
+    start = jwt.find('.') + 1
+    end = jwt.find('.', start)
+    if not start or end < 0:
+        print('Error: malformed JWT')
+        return payload
+    # JWT segments are base64url encoded with the padding stripped
+    jwt_payload = jwt[start:end]
+    jwt_payload += '=' * (-len(jwt_payload) % 4)
     try:
-        _, jwt_payload, _ = jwt.split('.')
-        jwt_payload = base64.b64decode(jwt_payload)
-        payload = json.loads(jwt_payload)
-    except Exception as err:
+        payload = json.loads(base64.urlsafe_b64decode(jwt_payload))
+    except ValueError as err:
         print(f'Error: {err}')
     return payload
 
@@ -43,12 +52,11 @@ def get_scenario_items_html(scenario_items: list) -> str:
     Returns:
         str: HTML string containing option elements
     """
-    html = ''
-    for item in scenario_items:
-        html += f'<option value="{item['scenario']['scenarioId']['S']}">'
-        html += item['scenario']['scenarioName']['S']
-        html += '</option>'
-    return html
+    return ''.join(
+        f'<option value="{item['scenario']['scenarioId']['S']}">'
+        f'{item['scenario']['scenarioName']['S']}</option>'
+        for item in scenario_items
+    )
 
 
 def get_scenario_items_js(scenario_items: list) -> str:
@@ -63,14 +71,86 @@ def get_scenario_items_js(scenario_items: list) -> str:
     """
     if not scenario_items:
         return '{}'
-    js = '{'
-    js += 'DEFAULT:'
-    js += f'"{scenario_items[0]['scenario']['scenarioId']['S']}",'
-    for item in scenario_items:
-        js += f'{item['scenario']['scenarioId']['S']}:'
-        js += f'"{item['scenario']['scenarioName']['S']}",'
-    js += '}'
-    return js
+    entries = [f'DEFAULT:"{scenario_items[0]['scenario']['scenarioId']['S']}"']
+    entries.extend(
+        f'{item['scenario']['scenarioId']['S']}:"{item['scenario']['scenarioName']['S']}"'
+        for item in scenario_items
+    )
+    return '{' + ','.join(entries) + '}'
+
+
+def load_html_template(file_name: str) -> Tuple[str, str, str]:
+    """
+    Load an HTML template from the Lambda bundle and split it around the scenario placeholders.
+
+    Args:
+        file_name (str): Name of the template file in the html directory
+
+    Returns:
+        tuple: (prefix, middle, suffix) template pieces, with the static assets URL
+               substituted, surrounding the {{SCENARIO_OPTIONS_JS}} and
+               {{SCENARIO_OPTIONS}} placeholders respectively
+    """
+    with open(f'html/{file_name}', 'r', encoding='utf-8') as f:
+        template = f.read().replace('{{ASSETS_URL}}', ASSETS_URL)
+    prefix, _, remainder = template.partition('{{SCENARIO_OPTIONS_JS}}')
+    middle, _, suffix = remainder.partition('{{SCENARIO_OPTIONS}}')
+    return prefix, middle, suffix
+
+
+# Read and split the HTML shell once during the INIT phase
+HTML_PREFIX, HTML_MIDDLE, HTML_SUFFIX = load_html_template('default.html')
+
+
+def handle_websocket_url(response: dict, _) -> dict:
+    """
+    Populate the response with a presigned WebSocket URL.
+
+    Args:
+        response (dict): Response object to populate
+        _ : Unused scenario items
+
+    Returns:
+        dict: Response object with a JSON body containing the WebSocket URL
+    """
+    url = generate_apigateway_presigned_url(
+        region=AWS_REGION,
+        expires=60
+    )
+    response['headers']['Content-Type'] = 'application/json'
+    response_object = {
+        'websocket_url': url
+    }
+    response['body'] = json.dumps(response_object, default=str)
+    return response
+
+
+def handle_default(response: dict, scenario_items: list) -> dict:
+    """
+    Populate the response with the HTML shell and scenario data.
+
+    Args:
+        response (dict): Response object to populate
+        scenario_items (list): List of scenario item dictionaries
+
+    Returns:
+        dict: Response object with the rendered HTML body
+    """
+    response['headers']['Content-Type'] = 'text/html'
+    response['body'] = ''.join([
+        HTML_PREFIX,
+        get_scenario_items_js(scenario_items),
+        HTML_MIDDLE,
+        get_scenario_items_html(scenario_items),
+        HTML_SUFFIX
+    ])
+    return response
+
+
+# GET routes keyed by the last path segment; anything else serves the HTML shell
+ROUTES = {
+    'get_websocket_url': handle_websocket_url,
+}
 
 
 def lambda_handler(event, _) -> dict:
@@ -79,9 +159,11 @@ def lambda_handler(event, _) -> dict:
 
     Handles:
     - Authentication via JWT
-    - Serving static assets (CSS, JS, PNG, WAV files)
     - Generating WebSocket URLs
-    - Serving HTML with scenario data
+    - Serving HTML with scenario data and the static assets URL
+
+    Static assets (CSS, JS, PNG, WAV files) are not served by this function; the
+    browser fetches them directly from the CloudFront distribution at ASSETS_URL.
 
     Args:
         event (dict): Lambda event object from API Gateway
@@ -106,45 +188,5 @@ def lambda_handler(event, _) -> dict:
         response['headers'] = {'Content-Type': 'text/plain'}
         return response
     scenario_items = {}
-    if method == 'GET' and path.find('assets/') != -1:
-        file_name = path.split('/')[-1]
-        file_type = file_name.split('.')[-1]
-        if file_type == 'css':
-            response['headers']['Content-Type'] = 'text/css'
-            with open(f'assets/css/{file_name}', 'r', encoding='utf-8') as f:
-                response['body'] = f.read()
-        elif file_type == 'js':
-            response['headers']['Content-Type'] = 'text/javascript'
-            with open(f'assets/js/{file_name}', 'r', encoding='utf-8') as f:
-                response['body'] = f.read().replace(
-                    '__SCENARIO_OPTIONS__',
-                    get_scenario_items_js(scenario_items)
-                )
-        elif file_type == 'png':
-            response['headers']['Content-Type'] = 'image/png'
-            with open(f'assets/img/{file_name}', 'rb') as f:
-                response['body'] = base64.b64encode(f.read())
-                response['isBase64Encoded'] = True
-        elif file_type == 'wav':
-            response['headers']['Content-Type'] = 'audio/wav'
-            with open(f'assets/audio/{file_name}', 'rb') as f:
-                response['body'] = base64.b64encode(f.read())
-                response['isBase64Encoded'] = True
-    elif method == 'GET' and path.find('get_websocket_url') != -1:
-        url = generate_apigateway_presigned_url(
-            region=AWS_REGION,
-            expires=60
-        )
-        response['headers']['Content-Type'] = 'application/json'
-        response_object = {
-            'websocket_url': url
-        }
-        response['body'] = json.dumps(response_object, default=str)
-    else:
-        response['headers']['Content-Type'] = 'text/html'
-        with open('html/default.html', 'r', encoding='utf-8') as f:
-            response['body'] = f.read().replace(
-                '{{SCENARIO_OPTIONS}}',
-                get_scenario_items_html(scenario_items)
-            )
-    return response
+    route = path.rpartition('/')[2] if method == 'GET' else ''
+    return ROUTES.get(route, handle_default)(response, scenario_items)
@@ -14,8 +14,8 @@ const inputText = document.getElementById('inputText');
 const websocketApplicationQueue = [];
 const websocketQueue = [];
 const pathWebsocketApplicationUrl = 'get_websocket_url';
-const pathRingToneUrl = 'assets/audio/start_tone.wav';
-const pathEmptyToneUrl = 'assets/audio/empty_tone.wav';
+const pathRingToneUrl = `${__ASSETS_URL__}/assets/audio/start_tone.wav`;
+const pathEmptyToneUrl = `${__ASSETS_URL__}/assets/audio/empty_tone.wav`;
 const queryString = window.location.search;
 const urlParams = new URLSearchParams(queryString);
 let websocketApplication;
@@ -153,13 +153,13 @@ function displayText(text, type, url = null) {
     if (type.toLowerCase() === 'utterance') {
       messageIconDiv.className = 'message-icon-left';
       messageIconDiv.innerHTML =
-        '<img class="memoji" src="../assets/img/memoji-person.png" />';
+        `<img class="memoji" src="${__ASSETS_URL__}/assets/img/memoji-person.png" />`;
       messageContainerDiv.appendChild(messageTextDiv);
       messageContainerDiv.appendChild(messageIconDiv);
     } else if (type.toLowerCase() === 'response') {
       messageIconDiv.className = 'message-icon-right';
       messageIconDiv.innerHTML =
-        '<img class="memoji" src="../assets/img/memoji-video.png" />';
+        `<img class="memoji" src="${__ASSETS_URL__}/assets/img/memoji-video.png" />`;
       messageContainerDiv.appendChild(messageIconDiv);
       messageContainerDiv.appendChild(messageTextDiv);
     } else if (type.toLowerCase() === 'feedback') {
@@ -290,7 +290,7 @@ function websocketApplicationConnect() {
         consoleLogger('Application Websocket: CONNECTED');
         websocketApplicationQueueProcessor({
           action: 'startProcess',
-          controls: JSON.stringify(localStorage),
+          controls: { ...localStorage },
         });
       });
 
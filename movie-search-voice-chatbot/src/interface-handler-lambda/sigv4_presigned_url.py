@@ -6,14 +6,44 @@ allowing secure, temporary access to AWS resources.
 """
 
 import datetime
+import functools
 import hashlib
 import hmac
 import os
 import urllib.parse
-import boto3
 
 
 WEBSOCKET_URL = os.environ['WEBSOCKET_URL']
+WEBSOCKET_URL_PARSED = urllib.parse.urlparse(WEBSOCKET_URL)
+WEBSOCKET_HOST = WEBSOCKET_URL_PARSED.netloc
+WEBSOCKET_PATH = WEBSOCKET_URL_PARSED.path
+
+# Hex-encoded SHA-256 digest of the empty string, the payload of presigned requests
+EMPTY_PAYLOAD_SHA256 = 'e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855'
+
+
+@functools.cache
+def get_credentials():
+    """
+    Resolve AWS credentials on first use and reuse them across warm invocations.
+
+    Returns:
+        Credentials: botocore credentials object; refreshable credentials are
+                     renewed when accessed through get_frozen_credentials()
+
+    Note:
+        botocore is imported here rather than at module level so that importing
+        this module does not pay the SDK import cost during cold start. Under
+        provisioned concurrency it is resolved at import instead, see below.
+    """
+    import botocore.session
+    return botocore.session.get_session().get_credentials()
+
+
+# Provisioned environments initialize before traffic arrives, so pay for the
+# SDK import and credential resolution there rather than on the first request
+if os.environ.get('AWS_LAMBDA_INITIALIZATION_TYPE') == 'provisioned-concurrency':
+    get_credentials()
 
 
 def to_time(timestamp: datetime) -> str:
@@ -55,8 +85,9 @@ def to_date(timestamp: datetime) -> str:
 def create_canonical_request(
         method: str,
         pathname: str,
-        query: dict,
+        query_string: str,
         headers: dict,
+        signed_headers: str,
         payload: str
 ) -> str:
     """
@@ -64,21 +95,23 @@ def create_canonical_request(
 
     Args:
         method (str): HTTP method
-        path (str): Request path
-        query_params (dict): Query string parameters
+        pathname (str): Request path
+        query_string (str): Canonical query string
         headers (dict): HTTP headers
+        signed_headers (str): Semicolon-delimited signed header names
+        payload (str): Hashed request payload
 
     Returns:
         str: Canonical request string formatted according to AWS specifications
     """
-    r = ''
-    r += method.upper() + '\n'
-    r += pathname + '\n'
-    r += create_canonical_query_string(query) + '\n'
-    r += create_canonical_headers(headers) + '\n'
-    r += create_signed_headers(headers) + '\n'
-    r += payload
-    return r
+    return '\n'.join([
+        method.upper(),
+        pathname,
+        query_string,
+        create_canonical_headers(headers),
+        signed_headers,
+        payload
+    ])
 
 
 def create_canonical_query_string(params: dict) -> str:
@@ -96,7 +129,7 @@ def create_canonical_query_string(params: dict) -> str:
         Parameters are sorted by key and URL-encoded according to AWS SigV4
         requirements for canonical query strings.
     """
-    return urllib.parse.urlencode((dict(sorted(params.items()))))
+    return urllib.parse.urlencode(sorted(params.items()))
 
 
 def create_canonical_headers(headers: dict) -> str:
@@ -142,12 +175,12 @@ def create_signed_headers(headers: dict) -> str:
     return ';'.join(sorted(headers.keys()))
 
 
-def create_credential_scope(timestamp: datetime, region: str, service: str) -> str:
+def create_credential_scope(date: str, region: str, service: str) -> str:
     """
     Create an AWS credential scope string for SigV4 signing.
 
     Args:
-        timestamp (datetime): The timestamp to use for the credential scope
+        date (str): The date to use for the credential scope in the format 'YYYYMMDD'
         region (str): AWS region name (e.g. 'us-east-1')
         service (str): AWS service name (e.g. 's3', 'execute-api')
 
@@ -160,17 +193,16 @@ def create_credential_scope(timestamp: datetime, region: str, service: str) -> s
         request signing process. It helps scope the signing key to a specific
         date, region and service.
     """
-    return f'{to_date(timestamp)}/{region}/{service}/aws4_request'
+    return f'{date}/{region}/{service}/aws4_request'
 
 
-def create_string_to_sign(timestamp: datetime, region: str, service: str, request: str) -> str:
+def create_string_to_sign(timestamp: str, credential_scope: str, request: str) -> str:
     """
     Create the string to sign for AWS SigV4 request signing.
 
     Args:
-        timestamp (datetime): The timestamp to use for the string to sign
-        region (str): AWS region name (e.g. 'us-east-1')
-        service (str): AWS service name (e.g. 's3', 'execute-api')
+        timestamp (str): The timestamp in the format 'YYYYMMDDTHHMMSSZ'
+        credential_scope (str): The credential scope created by create_credential_scope
         request (str): The canonical request string to hash
 
     Returns:
@@ -187,8 +219,8 @@ def create_string_to_sign(timestamp: datetime, region: str, service: str, reques
     """
     return '\n'.join([
         'AWS4-HMAC-SHA256',
-        to_time(timestamp),
-        create_credential_scope(timestamp, region, service),
+        timestamp,
+        credential_scope,
         hashlib.sha256(request.encode('utf-8')).hexdigest()
     ])
 
@@ -206,18 +238,20 @@ def hmac_sign(key: str, msg: str) -> str:
 
     Note:
         This function is used as part of the AWS SigV4 signing process to generate
-        signing keys and signatures. The message is UTF-8 encoded before signing.
+        signing keys and signatures. The message is UTF-8 encoded before signing and
+        hmac.digest is used to skip constructing an HMAC object per call.
     """
-    return hmac.new(key, msg.encode('utf-8'), hashlib.sha256).digest()
+    return hmac.digest(key, msg.encode('utf-8'), 'sha256')
 
 
-def get_signature_key(key: str, timestamp: datetime, region: str, service: str) -> str:
+@functools.lru_cache(maxsize=8)
+def get_signature_key(key: str, date: str, region: str, service: str) -> str:
     """
     Generate a signing key for AWS SigV4 request signing.
 
     Args:
         key (str): The AWS secret access key
-        timestamp (datetime): The timestamp to use for the signing key
+        date (str): The date to use for the signing key in the format 'YYYYMMDD'
         region (str): AWS region name (e.g. 'us-east-1')
         service (str): AWS service name (e.g. 's3', 'execute-api')
 
@@ -232,8 +266,11 @@ def get_signature_key(key: str, timestamp: datetime, region: str, service: str)
         2. The region with the result of #1
         3. The service name with the result of #2
         4. "aws4_request" with the result of #3
+
+        The derived key is valid for the whole UTC day, so it is cached per
+        secret key, date, region and service across warm invocations.
     """
-    key_date = hmac_sign(('AWS4' + key).encode('utf-8'), to_date(timestamp))
+    key_date = hmac_sign(('AWS4' + key).encode('utf-8'), date)
     key_region = hmac_sign(key_date, region)
     key_service = hmac_sign(key_region, service)
     key_signing = hmac_sign(key_service, 'aws4_request')
@@ -286,28 +323,35 @@ def create_presigned_url(
     options['query'] = options.get('query', {})
     options['headers']['host'] = host  # host is required
 
+    # Format the timestamp once and reuse the strings for every signing step
+    date = to_date(options['timestamp'])
+    time = to_time(options['timestamp'])
+    credential_scope = create_credential_scope(date, options['region'], service)
+
     query = {}
     for k, v in options['query'].items():
         query[k] = str(v)
     query['X-Amz-Algorithm'] = 'AWS4-HMAC-SHA256'
-    query['X-Amz-Credential'] = f'{options["key"]}/{
-        create_credential_scope(options["timestamp"], options["region"], service)}'
-    query['X-Amz-Date'] = to_time(options['timestamp'])
+    query['X-Amz-Credential'] = f'{options["key"]}/{credential_scope}'
+    query['X-Amz-Date'] = time
     query['X-Amz-Expires'] = options['expires']
-    query['X-Amz-SignedHeaders'] = create_signed_headers(options['headers'])
+    signed_headers = create_signed_headers(options['headers'])
+    query['X-Amz-SignedHeaders'] = signed_headers
     query['X-Amz-Security-Token'] = options['sessionToken']
 
+    canonical_query_string = create_canonical_query_string(query)
     canonical_request = create_canonical_request(
-        method, path, query, options['headers'], payload)
+        method, path, canonical_query_string, options['headers'], signed_headers, payload)
     string_to_sign = create_string_to_sign(
-        options['timestamp'], options['region'], service, canonical_request)
+        time, credential_scope, canonical_request)
     signing_key = get_signature_key(
-        options['secret'], options['timestamp'], options['region'], service)
-    signature = hmac.new(signing_key, (string_to_sign).encode(
-        'utf-8'), hashlib.sha256).hexdigest()
-    query['X-Amz-Signature'] = signature
+        options['secret'], date, options['region'], service)
+    signature = hmac.digest(
+        signing_key, string_to_sign.encode('utf-8'), 'sha256').hex()
 
-    return f'{options['protocol']}://{host}{path}?{urllib.parse.urlencode((dict(sorted(query.items()))))}'
+    # The signature is not part of the canonical query string, so append it
+    # instead of sorting and encoding the whole query a second time
+    return f'{options['protocol']}://{host}{path}?{canonical_query_string}&X-Amz-Signature={signature}'
 
 
 def generate_presigned_url(
@@ -336,13 +380,13 @@ def generate_presigned_url(
     Returns:
         str: The pre-signed URL for accessing the specified AWS service and resource.
     """
-    credentials = boto3.Session().get_credentials()
+    credentials = get_credentials().get_frozen_credentials()
     url = create_presigned_url(
         method=method,
         host=host,
         path=path,
         service=service,
-        payload=hashlib.sha256(''.encode('utf-8')).hexdigest(),
+        payload=EMPTY_PAYLOAD_SHA256,
         options={
             'key': credentials.access_key,
             'secret': credentials.secret_key,
@@ -408,12 +452,12 @@ def generate_apigateway_presigned_url(
         str: The pre-signed URL for accessing the API Gateway WebSocket API.
 
     Note:
-        This function assumes the existence of a global variable `WEBSOCKET_URL` containing
-        the URL of the API Gateway WebSocket API.
+        This function uses the host and path of the `WEBSOCKET_URL` environment variable,
+        which contains the URL of the API Gateway WebSocket API and is parsed once at import.
     """
     return generate_presigned_url(
-        host=WEBSOCKET_URL.split('//')[1].split('/')[0],
-        path=f'/{WEBSOCKET_URL.split('//')[1].split('/')[1]}',
+        host=WEBSOCKET_HOST,
+        path=WEBSOCKET_PATH,
         service='execute-api',
         region=region,
         protocol='wss',
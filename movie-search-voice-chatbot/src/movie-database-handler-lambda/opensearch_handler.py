@@ -11,14 +11,14 @@ Environment variables required:
     OS_INDEX: OpenSearch index name
 """
 
+import functools
 import html
-import json
 import logging
 import os
 import re
-import boto3
-import requests
-from requests_aws4auth import AWS4Auth
+import socket
+import orjson
+import urllib3
 
 
 logger = logging.getLogger()
@@ -31,11 +31,60 @@ OS_INDEX = os.environ['OS_INDEX']
 OS_SERVICE = 'es'
 
 # The OpenSearch domain endpoint with https:// and without a trailing slash
-os_url = 'https://' + OS_HOST + '/' + OS_INDEX + '/_search'
+os_path = '/' + OS_INDEX + '/_search'
+os_url = 'https://' + OS_HOST + os_path
+
+# Single TLS connection to the OpenSearch domain, kept alive across warm invocations
+http = urllib3.HTTPSConnectionPool(
+    OS_HOST,
+    maxsize=1,
+    timeout=urllib3.Timeout(connect=5, read=25),
+    socket_options=urllib3.connection.HTTPConnection.default_socket_options + [
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ],
+)
+
+
+@functools.cache
+def get_sigv4auth():
+    """
+    Create the SigV4 signer on first use and reuse it across warm invocations.
+
+    Returns:
+        SigV4Auth: botocore signer for the OpenSearch service in OS_REGION
+
+    Note:
+        botocore is imported here rather than at module level so that the SDK
+        import and credential resolution do not add to cold start time. Under
+        provisioned concurrency it is created at import instead, see below.
+    """
+    import botocore.session
+    from botocore.auth import SigV4Auth
+    credentials = botocore.session.get_session().get_credentials()
+    return SigV4Auth(credentials, OS_SERVICE, OS_REGION)
+
 
-credentials = boto3.Session().get_credentials()
-awsauth = AWS4Auth(credentials.access_key, credentials.secret_key,
-                   OS_REGION, OS_SERVICE, session_token=credentials.token)
+# Provisioned environments initialize before traffic arrives, so pay for the
+# SDK import and credential resolution there rather than on the first request
+if os.environ.get('AWS_LAMBDA_INITIALIZATION_TYPE') == 'provisioned-concurrency':
+    get_sigv4auth()
+
+
+def sign_request(data: bytes, headers: dict) -> dict:
+    """
+    Sign an OpenSearch search request with SigV4.
+
+    Args:
+        data (bytes): Request body
+        headers (dict): Request headers to sign
+
+    Returns:
+        dict: Request headers including the SigV4 authentication headers
+    """
+    from botocore.awsrequest import AWSRequest
+    request = AWSRequest(method='GET', url=os_url, data=data, headers=headers)
+    get_sigv4auth().add_auth(request)
+    return dict(request.headers)
 
 
 def lambda_handler(event, _) -> dict:
@@ -52,20 +101,28 @@ def lambda_handler(event, _) -> dict:
     Returns:
         dict: Response object with status code, headers and search results in body
               Status code 400 if title parameter is missing or empty
-              Status code 200 with search results on success
+              Status code 200 with search results on success, or an empty
+              list when nothing matches
+              The OpenSearch status code if the search request fails
 
     Raises:
         KeyError: If required environment variables are missing
     """
     logger.info(event)
 
-    if not 'queryStringParameters' in event or not 'title' in event['queryStringParameters']:
+    params = event.get('queryStringParameters') or {}
+    title = params.get('title')
+    year = params.get('year')
+    actors = params.get('actors')
+    directors = params.get('directors')
+
+    if title is None:
         return {
             "statusCode": 400,
             "body": "Missing query string parameter 'title'"
         }
 
-    if len(event['queryStringParameters']['title']) == 0:
+    if len(title) == 0:
         return {
             "statusCode": 400,
             "body": "Query string parameter 'title' must not be empty"
@@ -79,7 +136,7 @@ def lambda_handler(event, _) -> dict:
                     {
                         "match": {
                             "titleDisplay": {
-                                "query": html.unescape(event['queryStringParameters']['title']),
+                                "query": html.unescape(title),
                                 "_name": "query-must"
                             }
                         }
@@ -98,39 +155,36 @@ def lambda_handler(event, _) -> dict:
         }
     }
 
-    if 'year' in event['queryStringParameters'] and \
-            len(event['queryStringParameters']['year']) > 0:
+    if year:
         query["query"]["bool"]["should"].append(
             {
                 "match": {
                     "year": {
-                        "query": event['queryStringParameters']['year'],
+                        "query": year,
                         "_name": "query-should"
                     }
                 }
             }
         )
 
-    if 'actors' in event['queryStringParameters'] and \
-            len(event['queryStringParameters']['actors']) > 0:
+    if actors:
         query["query"]["bool"]["should"].append(
             {
                 "match": {
                     "stars": {
-                        "query": html.unescape(event['queryStringParameters']['actors']),
+                        "query": html.unescape(actors),
                         "_name": "query-should"
                     }
                 }
             }
         )
 
-    if 'directors' in event['queryStringParameters'] and \
-            len(event['queryStringParameters']['directors']) > 0:
+    if directors:
         query["query"]["bool"]["should"].append(
             {
                 "match": {
                     "directors": {
-                        "query": html.unescape(event['queryStringParameters']['directors']),
+                        "query": html.unescape(directors),
                         "_name": "query-should"
                     }
                 }
@@ -141,13 +195,27 @@ def lambda_handler(event, _) -> dict:
     headers = {"Content-Type": "application/json"}
 
     # Make the signed HTTP request
-    r = requests.get(
-        url=os_url,
-        auth=awsauth,
-        headers=headers,
-        data=json.dumps(query)
+    data = orjson.dumps(query)
+    r = http.request(
+        'GET',
+        os_path,
+        body=data,
+        headers=sign_request(data, headers)
     )
 
+    # Surface OpenSearch failures, such as a rejected signature, instead of an empty result
+    if not 200 <= r.status < 300:
+        logging.error('OpenSearch response: %s %s', r.status, r.data)
+        return {
+            "statusCode": r.status,
+            "headers": {
+                "Access-Control-Allow-Origin": '*'
+            },
+            "body": "OpenSearch request failed"
+        }
+
+    hits = orjson.loads(r.data).get('hits', {}).get('hits', [])
+
     # Create the response and add some extra content to support CORS
     response = {
         "statusCode": 200,
@@ -155,12 +223,8 @@ def lambda_handler(event, _) -> dict:
             "Access-Control-Allow-Origin": '*'
         },
         "isBase64Encoded": False,
-        "body": json.dumps([])
+        "body": orjson.dumps(hits[:1]).decode()
     }
 
-    items = r.json()['hits']['hits']
-
-    response['body'] = json.dumps([items[0]])
-
     logging.info(response)
     return response
@@ -27,10 +27,7 @@ logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 REGION = os.getenv('REGION')
-SESSION = boto3.Session(
-    region_name=REGION,
-)
-BEDROCK_CLIENT = SESSION.client('bedrock-runtime')
+BEDROCK_CLIENT = boto3.client('bedrock-runtime', region_name=REGION)
 BEDROCK_MODEL_ID = os.getenv('BEDROCK_MODEL_ID')
 BEDROCK_MAX_TOKENS = os.getenv('BEDROCK_MAX_TOKENS')
 BEDROCK_STREAM_TEMPERATURE = os.getenv('BEDROCK_STREAM_TEMPERATURE')
@@ -42,6 +39,13 @@ logger.info('BEDROCK_MAX_TOKENS: %s', BEDROCK_MAX_TOKENS)
 logger.info('BEDROCK_STREAM_TEMPERATURE: %s', BEDROCK_STREAM_TEMPERATURE)
 logger.info('BEDROCK_TOP_P: %s', BEDROCK_TOP_P)
 
+# Environment variables are immutable, so the inference config is built once
+BEDROCK_INFERENCE_CONFIG = {
+    'maxTokens': int(BEDROCK_MAX_TOKENS),
+    'temperature': float(BEDROCK_STREAM_TEMPERATURE),
+    'topP': float(BEDROCK_TOP_P)
+}
+
 
 def invoke_model_with_response_stream(
     prompt: str,
@@ -74,10 +78,6 @@ def invoke_model_with_response_stream(
                 ],
             }
         ],
-        inferenceConfig={
-            'maxTokens': int(BEDROCK_MAX_TOKENS),
-            'temperature': float(BEDROCK_STREAM_TEMPERATURE),
-            'topP': float(BEDROCK_TOP_P)
-        },
+        inferenceConfig=BEDROCK_INFERENCE_CONFIG,
     )
     return streaming_response
@@ -15,24 +15,31 @@ Functions:
 
 Dependencies:
     boto3: AWS SDK for Python
-    json: For JSON serialization/deserialization
+    botocore: For client connection configuration
+    orjson: For JSON serialization/deserialization
     time: For TTL calculations
     os: For environment variable access
     logging: For logging configuration
 """
 
-import json
 import logging
 import os
 import time
 import boto3
+import orjson
+from botocore.config import Config
 
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 DYNAMODB_TABLE = os.environ['DYNAMODB_TABLE']
-DYNAMODB_CLIENT = boto3.client('dynamodb')
+# Keep connections alive so warm invocations skip the TCP and TLS handshakes
+DYNAMODB_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=10,
+    retries={'max_attempts': 2, 'mode': 'standard'})
+DYNAMODB_CLIENT = boto3.client('dynamodb', config=DYNAMODB_CONFIG)
 
 
 def dynamodb_update_item_data(connection_id: str, data: dict) -> None:
@@ -54,11 +61,15 @@ def dynamodb_update_item_data(connection_id: str, data: dict) -> None:
         Key={
             'connectionId': {'S': connection_id}
         },
-        AttributeUpdates={
-            'data': {'Value': {'S': json.dumps(data)},
-                     'Action': 'PUT'},
-            'ttl': {'Value': {'N': str(int(time.time()) + 86400)},
-                    'Action': 'PUT'},
+        # data and ttl are reserved words, so they go through attribute names
+        UpdateExpression='SET #data = :data, #ttl = :ttl',
+        ExpressionAttributeNames={
+            '#data': 'data',
+            '#ttl': 'ttl',
+        },
+        ExpressionAttributeValues={
+            ':data': {'S': orjson.dumps(data).decode()},
+            ':ttl': {'N': str(int(time.time()) + 86400)},
         }
     )
 
@@ -98,5 +109,5 @@ def get_item_data(connection_id: str) -> dict:
     """
     item = dynamodb_get_item(connection_id)
     if 'data' in item:
-        return json.loads(item['data']['S'])
+        return orjson.loads(item['data']['S'])
     return {}
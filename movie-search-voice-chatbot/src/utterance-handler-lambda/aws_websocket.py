@@ -9,23 +9,30 @@ Environment Variables:
 
 Dependencies:
     - boto3
-    - json
+    - botocore
+    - orjson
     - logging
     - os
 """
 
-import json
 import logging
 import os
 import boto3
+import orjson
+from botocore.config import Config
 
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 WEBSOCKET_URL = os.environ['WEBSOCKET_URL']
+# Keep connections alive so warm invocations skip the TCP and TLS handshakes
+WEBSOCKET_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=10,
+    retries={'max_attempts': 2, 'mode': 'standard'})
 WEBSOCKET_CLIENT = boto3.client(
-    'apigatewaymanagementapi', endpoint_url=WEBSOCKET_URL)
+    'apigatewaymanagementapi', endpoint_url=WEBSOCKET_URL, config=WEBSOCKET_CONFIG)
 
 
 def websocket_send_message(connection_id: str, message: dict) -> None:
@@ -46,7 +53,7 @@ def websocket_send_message(connection_id: str, message: dict) -> None:
     try:
         WEBSOCKET_CLIENT.post_to_connection(
             ConnectionId=connection_id,
-            Data=json.dumps(message)
+            Data=orjson.dumps(message)
         )
     except WEBSOCKET_CLIENT.exceptions.GoneException:
         pass
@@ -15,13 +15,16 @@ Environment Variables:
     MEMCACHED_ENDPOINT: Optional memcached endpoint for caching (currently disabled)
 """
 
-import json
 import logging
 import os
 import random
 import re
+import time
+from collections import OrderedDict
 from typing import Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 logger = logging.getLogger()
@@ -30,6 +33,36 @@ logger.setLevel(logging.INFO)
 MOVIE_DATABASE_URL = os.getenv('MOVIE_DATABASE_URL')
 logger.info('MOVIE_DATABASE_URL: %s', MOVIE_DATABASE_URL)
 
+# Pooled session so warm invocations reuse the TCP and TLS connection
+MOVIE_DATABASE_SESSION = requests.Session()
+MOVIE_DATABASE_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=10,
+    max_retries=Retry(total=1, backoff_factor=0.1)))
+
+# Tag contents stop at the next '<' so a missing closing tag cannot make
+# the engine rescan the rest of the streamed payload
+SHOW_RE = re.compile(r'<show>([^<\n]*)</show>')
+YEAR_RE = re.compile(r'<year>(\d*)</year>')
+ACTOR_RE = re.compile(r'<actor>([^<\n]*)</actor>')
+DIRECTOR_RE = re.compile(r'<director>([^<\n]*)</director>')
+
+# Star icons for every rating out of ten, a full star per two points
+STAR_RATINGS = [
+    ''.join(
+        '<i class="bi bi-star-fill"></i>' if i <= r
+        else '<i class="bi bi-star-half"></i>' if i == r + 1
+        else ''
+        for i in range(2, 11, 2)
+    )
+    for r in range(11)
+]
+
+# Successful lookups kept per warm container, keyed by the query parameters
+MOVIE_DATABASE_CACHE = OrderedDict()
+MOVIE_DATABASE_CACHE_TTL = 3600
+MOVIE_DATABASE_CACHE_SIZE = 512
+
 
 def get_movie_database_record(title: str, year: str, actors: str, directors: str) -> dict:
     """
@@ -40,8 +73,16 @@ def get_movie_database_record(title: str, year: str, actors: str, directors: str
         year: Release year of the movie
 
     Returns:
-        dict: Movie information from the database
+        dict: Movie information from the database, or None if the lookup failed
+
+    Note:
+        Successful lookups are cached in memory for an hour. Failed lookups
+        are not cached, so they are retried on the next request.
     """
+    cache_key = (title, year, actors, directors)
+    cached = MOVIE_DATABASE_CACHE.get(cache_key)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
     response = None
     logging.info('Movie database lookup: %s %s %s %s',
                  title, year, actors, directors)
@@ -52,18 +93,14 @@ def get_movie_database_record(title: str, year: str, actors: str, directors: str
     params['actors'] = actors
     params['directors'] = directors
     try:
-        response = requests.get(
+        response = MOVIE_DATABASE_SESSION.get(
             url=MOVIE_DATABASE_URL,
             params=params,
             timeout=10
         ).json()[0]['_source']
     except Exception as e:
         logging.error('Movie database response: %s', e)
-        return {
-            'Poster': '',
-            'Rating': random.randint(1, 10) / 2,
-            'Votes': 0
-        }
+        return None
     movie_database_record = {}
     movie_database_record['Poster'] = response.get('poster_url', '')
     movie_database_record['Rating'] = response.get('rating', {}).get(
@@ -71,8 +108,11 @@ def get_movie_database_record(title: str, year: str, actors: str, directors: str
     movie_database_record['Votes'] = response.get(
         'rating', {}).get('numberOfVotes', 0)
 
-    logging.info('Movie database record: %s',
-                 json.dumps(movie_database_record))
+    logging.info('Movie database record: %s', movie_database_record)
+    if len(MOVIE_DATABASE_CACHE) >= MOVIE_DATABASE_CACHE_SIZE:
+        MOVIE_DATABASE_CACHE.popitem(last=False)
+    MOVIE_DATABASE_CACHE[cache_key] = (
+        time.monotonic() + MOVIE_DATABASE_CACHE_TTL, movie_database_record)
     return movie_database_record
 
 
@@ -86,20 +126,10 @@ def get_title_and_year(payload: str) -> Tuple[str, str]:
     Returns:
         dict: Mapping of show titles to their years
     """
-    title = re.search(
-        r'<show>(.*?)</show>', payload)
-    year = re.search(
-        r'<year>(\d*?)</year>', payload)
-    actors = " ".join(re.findall(r'<actor>(.*?)</actor>', payload))
-    directors = " ".join(re.findall(r'<director>(.*?)</director>', payload))
-    if title:
-        title = title.group(1)
-    else:
-        title = ''
-    if year:
-        year = year.group(1)
-    else:
-        year = ''
+    title = match.group(1) if (match := SHOW_RE.search(payload)) else ''
+    year = match.group(1) if (match := YEAR_RE.search(payload)) else ''
+    actors = " ".join(ACTOR_RE.findall(payload))
+    directors = " ".join(DIRECTOR_RE.findall(payload))
     return title, year, actors, directors
 
 
@@ -111,16 +141,9 @@ def generate_random_rating() -> str:
         str: HTML string with star icons and fake view count
     """
     r = random.randint(1, 10)
-    stars = [
-        '<i class="bi bi-star-fill"></i>' if i <= r
-        else '<i class="bi bi-star-half"></i>' if i == r + 1
-        else ''
-        for i in range(2, 11, 2)
-    ]
-
     n = random.randint(0, 3)
     d = random.randint(1, 9)
-    return ''.join(stars) + f' {n}.{d}K'
+    return f'{STAR_RATINGS[r]} {n}.{d}K'
 
 
 def generate_movie_database_rating(movie_database_record: dict) -> str:
@@ -134,23 +157,19 @@ def generate_movie_database_rating(movie_database_record: dict) -> str:
         str: HTML string with star icons based on IMDb rating and view count
     """
     try:
-        stars = []
+        # Ratings outside 0-10 render the same as the nearest bound
         r = round(movie_database_record['Rating'])
+        stars = STAR_RATINGS[min(max(r, 0), 10)]
 
-        # Build list of star elements
-        for i in range(2, 11, 2):
-            if i <= r:
-                stars.append('<i class="bi bi-star-fill"></i>')
-            elif i == r + 1:
-                stars.append('<i class="bi bi-star-half"></i>')
-
-        # Calculate view count
-        i = int(re.sub(r'[\D]', '', str(movie_database_record['Votes'])))
-        n = int(i / 1000)
-        d = int((i % 1000) / 100)
+        # Calculate view count, votes are normally already a plain count
+        votes = movie_database_record['Votes']
+        if type(votes) is not int or votes < 0:
+            votes = int(''.join(filter(str.isdecimal, str(votes))))
+        n, d = divmod(votes, 1000)
+        d //= 100
 
-        # Join stars and append view count
-        return ''.join(stars) + f' {n}.{d}K'
+        # Append view count to stars
+        return f'{stars} {n}.{d}K'
 
     except ValueError:
         return generate_random_rating()
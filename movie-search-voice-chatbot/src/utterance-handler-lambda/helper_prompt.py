@@ -14,26 +14,8 @@ import logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-
-def generate_prompt(question: str, history: list) -> str:
-    """
-    Generate a structured prompt for the video assistant chatbot.
-
-    This function creates a prompt that includes instructions for XML tag formatting,
-    examples of proper tag usage, and handling of conversation history. The prompt
-    guides the assistant to provide structured responses about movies, TV shows and
-    documentaries.
-
-    Args:
-        question (str): The user's question or request to the video assistant
-        history (list): List of previous conversation records between user and assistant
-
-    Returns:
-        str: A formatted prompt string containing instructions, examples, conversation
-             history if relevant, and the user's question
-    """
-
-    prompt = """
+# Static prompt sections, built once at import
+PROMPT_HEADER = """
 You are a streaming video assistant, skilled in answering questions about movies,
 television shows, and documentaries based on titles, genres, actors, directors,
 and maturity ratings.
@@ -41,14 +23,8 @@ and maturity ratings.
 You are talking to a user who is seeking guidance on what to watch next.
 
 """
-    if history:
-        prompt += f"""
-**Conversation History**:
-{history}
 
-        """
-
-    prompt += """
+PROMPT_INSTRUCTIONS = """
 **Formatting Rules**:
 - The movie, television, or documentary record must be wrapped in <record></record> tags.
 - Movie, television, or documentary titles must be wrapped with <show></show> tags.
@@ -217,13 +193,39 @@ Assistant:
 
         """
 
-    prompt += f"""
+
+def generate_prompt(question: str, history: list) -> str:
+    """
+    Generate a structured prompt for the video assistant chatbot.
+
+    This function creates a prompt that includes instructions for XML tag formatting,
+    examples of proper tag usage, and handling of conversation history. The prompt
+    guides the assistant to provide structured responses about movies, TV shows and
+    documentaries.
+
+    Args:
+        question (str): The user's question or request to the video assistant
+        history (list): List of previous conversation records between user and assistant
+
+    Returns:
+        str: A formatted prompt string containing instructions, examples, conversation
+             history if relevant, and the user's question
+    """
+
+    parts = [PROMPT_HEADER]
+    if history:
+        parts.append(f"""
+**Conversation History**:
+{history}
+
+        """)
+    parts.append(PROMPT_INSTRUCTIONS)
+    parts.append(f"""
 Answer the following question:
 User: {question}
 
-        """
-
-    return prompt
+        """)
+    return ''.join(parts)
 
 
 def check_history_for_relevancy(history: list) -> list:
@@ -248,12 +250,12 @@ def check_history_for_relevancy(history: list) -> list:
     if records <= 2:
         logging.info('Leaving history unchanged')
         return history
-    if history[-1]['Assistant'].find('<record>') < 0 and \
-            history[-2]['Assistant'].find('<record>') < 0:
+    if '<record>' not in history[-1]['Assistant'] and \
+            '<record>' not in history[-2]['Assistant']:
         logging.info('Purging history')
         return []
-    for i, record in enumerate(history[:-2]):
-        if record['Assistant'].find('<record>') < 0:
-            logging.info('Purging record: %s', str(i))
-            history.pop(i)
+    # Filter in place so the purge also applies to the history that is persisted
+    relevant = [record for record in history[:-2] if '<record>' in record['Assistant']]
+    logging.info('Purging records: %s', records - 2 - len(relevant))
+    history[:-2] = relevant
     return history
@@ -12,6 +12,9 @@ Functions:
     remove_empty_tag(text: str) -> str:
         Removes any empty HTML tags from the text.
 
+    scan_structure_tags(text: str) -> dict:
+        Locates and counts the record and answer tags in one pass.
+
     is_full_record(text: str) -> bool:
         Checks if text contains a complete record (has both opening and closing tags).
 
@@ -32,10 +35,18 @@ Functions:
 
     append_image_to_record(record: str) -> str:
         Enriches record with movie poster image and rating information.
+
+    enrich_record(record: str) -> str:
+        Enriches record with image, rating and trailing description.
 """
 
+import functools
 import logging
 import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple
 
 from helper_movie import get_movie_database_record, get_title_and_year, \
@@ -44,6 +55,23 @@ from helper_movie import get_movie_database_record, get_title_and_year, \
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+OPEN_TAG_RE = re.compile(r'<([^>^/]*)>')
+CLOSE_TAG_RE = re.compile(r'</([^<>]*)>')
+EMPTY_TAG_RE = re.compile(r'<([^>^/]*)>\s*</\1>')
+DESCRIPTION_RE = re.compile(r'<description>(.+?)</description>', re.DOTALL)
+STRUCTURE_TAG_RE = re.compile(r'<(/?)(record|answer)')
+
+# Shared pool so movie database lookups for several records run concurrently
+RECORD_EXECUTOR = ThreadPoolExecutor(max_workers=8)
+
+# Titles the movie database has no poster for, keyed by (title, year) with
+# their expiry time. Failed lookups are not cached, so they are retried.
+# Record executor threads share it, so writes hold the lock.
+NO_POSTER_CACHE = OrderedDict()
+NO_POSTER_CACHE_LOCK = threading.Lock()
+NO_POSTER_CACHE_TTL = 600
+NO_POSTER_CACHE_SIZE = 1024
+
 
 def is_balanced_tag(text: str) -> bool:
     """
@@ -60,9 +88,16 @@ def is_balanced_tag(text: str) -> bool:
     if text.count('<') != text.count('>'):
         logging.debug('Unbalanced tags')
         return False
-    tags = re.findall(r'<([^>^/]*)>', text)
-    for tag in tags:
-        if text.count(f'<{tag}>') != text.count(f'</{tag}>'):
+    tags = OPEN_TAG_RE.findall(text)
+    if any('<' in tag for tag in tags):
+        # A stray '<' inside a tag hides other tags from the patterns, count literally
+        opening_tags = {tag: text.count(f'<{tag}>') for tag in tags}
+        closing_tags = {tag: text.count(f'</{tag}>') for tag in tags}
+    else:
+        opening_tags = Counter(tags)
+        closing_tags = Counter(CLOSE_TAG_RE.findall(text))
+    for tag, count in opening_tags.items():
+        if count != closing_tags.get(tag, 0):
             logging.debug('Unmatched tag: %s', tag)
             return False
     return True
@@ -94,15 +129,50 @@ def remove_empty_tag(text: str) -> str:
         str: Text with empty tags removed
     """
     text = remove_escaped_quotes(text)
-    while True:
-        tags = re.findall(r'<([^>^/]*)>[\s]*<\/\1>', text)
-        if not tags:
-            break
-        for tag in tags:
-            text = re.sub(rf'<{tag}>[\s]*</{tag}>', '', text)
+    # Repeat until nothing changes so that nested empty tags collapse too
+    previous = None
+    while previous != text:
+        previous = text
+        text = EMPTY_TAG_RE.sub('', text)
     return text
 
 
+@functools.lru_cache(maxsize=4)
+def scan_structure_tags(text: str) -> dict:
+    """
+    Locate and count the record and answer tags of a text in one pass.
+
+    Args:
+        text (str): Text to scan
+
+    Returns:
+        dict: First index of each tag (-1 when missing) and record tag counts
+
+    Note:
+        The result is cached, so the successive structure checks made on
+        the same streamed buffer share a single scan.
+    """
+    tags = {
+        'record_open': -1,
+        'record_close': -1,
+        'answer_open': -1,
+        'answer_close': -1,
+        'record_open_count': 0,
+        'record_close_count': 0,
+    }
+    for match in STRUCTURE_TAG_RE.finditer(text):
+        closing, name = match.groups()
+        if name == 'record':
+            tags['record_close_count' if closing else 'record_open_count'] += 1
+        # Closing tags only count as found when the bracket is complete
+        if closing and not text.startswith('>', match.end()):
+            continue
+        key = f"{name}_{'close' if closing else 'open'}"
+        if tags[key] < 0:
+            tags[key] = match.start()
+    return tags
+
+
 def is_full_record(text: str) -> bool:
     """
     Check if text contains a complete record with both opening and closing tags.
@@ -113,7 +183,8 @@ def is_full_record(text: str) -> bool:
     Returns:
         bool: True if record is complete, False otherwise
     """
-    if text.find('<record') < text.find('</record>'):
+    tags = scan_structure_tags(text)
+    if tags['record_open'] < tags['record_close']:
         return True
     return False
 
@@ -128,7 +199,8 @@ def is_full_answer(text: str) -> bool:
     Returns:
         bool: True if record is complete, False otherwise
     """
-    if text.find('<answer') < text.find('</answer>'):
+    tags = scan_structure_tags(text)
+    if tags['answer_open'] < tags['answer_close']:
         return True
     return False
 
@@ -143,7 +215,8 @@ def is_full_unclosed_record(text: str) -> bool:
     Returns:
         bool: True if record is unclosed, False otherwise
     """
-    if text.count('<record') == 2 and text.count('</record') == 0:
+    tags = scan_structure_tags(text)
+    if tags['record_open_count'] == 2 and tags['record_close_count'] == 0:
         logging.info("Found unclosed record")
         return True
     return False
@@ -179,12 +252,13 @@ def correct_record_tag(text: str) -> str:
     Returns:
         str: Text with corrected record tags
     """
+    tags = scan_structure_tags(text)
     last_tag_index = text.find('>', text.rfind('</')) + 1
-    if text.count('<record') == 2 and text.count('</record') == 0:
+    if tags['record_open_count'] == 2 and tags['record_close_count'] == 0:
         text_pieces = text.split('<record')
         text = '<record'.join(
             text_pieces[:-1]) + '</record><record' + text_pieces[-1]
-    elif text.count('<record') == 1 and text.find('\n', last_tag_index) == last_tag_index:
+    elif tags['record_open_count'] == 1 and text.find('\n', last_tag_index) == last_tag_index:
         text = text[:last_tag_index] + '</record>' + text[last_tag_index:]
     return text
 
@@ -199,10 +273,8 @@ def separate_record(text: str) -> Tuple[str, str]:
     Returns:
         tuple: (record, remaining_text)
     """
-    text_pieces = text.split('</record>')
-    text = text_pieces[0] + '</record>'
-    remained = '</record>'.join(text_pieces[1:])
-    return text, remained
+    text, _, remained = text.partition('</record>')
+    return text + '</record>', remained
 
 
 def separate_answer(text: str) -> Tuple[str, str]:
@@ -215,10 +287,8 @@ def separate_answer(text: str) -> Tuple[str, str]:
     Returns:
         tuple: (answer, remaining_text)
     """
-    text_pieces = text.split('</answer>')
-    text = text_pieces[0] + '</answer>'
-    remained = '</answer>'.join(text_pieces[1:])
-    return text, remained
+    text, _, remained = text.partition('</answer>')
+    return text + '</answer>', remained
 
 
 def append_description_to_record(record: str) -> str:
@@ -231,17 +301,14 @@ def append_description_to_record(record: str) -> str:
     Returns:
         str: Record with description tags appended
     """
-    descriptions = re.findall(r'<description>(.+)<\/description>', record)
+    descriptions = DESCRIPTION_RE.findall(record)
     if not descriptions:
         return record
-    record = record.replace('</record>', '')
-    for description in descriptions:
-        record = record.replace(
-            f'<description>{description}</description>', '')
-    for description in descriptions:
-        record += f'<description>{description}</description>'
-    record += '</record>'
-    return record
+    record = DESCRIPTION_RE.sub('', record).replace('</record>', '')
+    return record + ''.join(
+        f'<description>{description}</description>'
+        for description in descriptions
+    ) + '</record>'
 
 
 def append_image_to_record(record: str) -> str:
@@ -253,24 +320,54 @@ def append_image_to_record(record: str) -> str:
 
     Returns:
         str: Record with image and rating information added
+
+    Note:
+        Titles without a poster are remembered for a while and skip the
+        movie database lookup entirely. Failed lookups are not remembered.
     """
     title, year, actors, directors = get_title_and_year(payload=record)
     logging.debug('Title: %s Year: %s Actors: %s Directors: %s',
                   title, year, actors, directors)
+    no_poster_key = (title, year)
+    expiry = NO_POSTER_CACHE.get(no_poster_key)
+    if expiry and expiry > time.monotonic():
+        logging.debug('Skipping lookup without poster: %s %s', title, year)
+        return record
     movie_database_record = get_movie_database_record(
         title, year, actors, directors)
-    if movie_database_record and \
-            'Poster' in movie_database_record and \
+    if movie_database_record is None:
+        return record
+    if 'Poster' in movie_database_record and \
             movie_database_record['Poster'] and \
             movie_database_record['Poster'].startswith('https://'):
         logging.debug('Poster url: %s', movie_database_record['Poster'])
         stars = generate_movie_database_rating(movie_database_record)
         record = record.replace(
             f'<show>{title}',
-            '<img class="poster" src="' +
-            movie_database_record['Poster'] +
-            f'" /><stars>{stars}</stars> ' +
-            '<play><i class="bi bi-play-btn-fill"></i></play>' +
-            f'<show>{title}'
+            f'<img class="poster" src="{movie_database_record["Poster"]}" />'
+            f'<stars>{stars}</stars> '
+            f'<play><i class="bi bi-play-btn-fill"></i></play><show>{title}'
         )
+    else:
+        with NO_POSTER_CACHE_LOCK:
+            if len(NO_POSTER_CACHE) >= NO_POSTER_CACHE_SIZE:
+                NO_POSTER_CACHE.popitem(last=False)
+            NO_POSTER_CACHE[no_poster_key] = time.monotonic() + NO_POSTER_CACHE_TTL
     return record
+
+
+def enrich_record(record: str) -> str:
+    """
+    Enrich record with movie poster image, rating and trailing description.
+
+    Args:
+        record (str): Record to enrich
+
+    Returns:
+        str: Record with image, rating and description information added
+
+    Note:
+        The movie database lookup is blocking I/O, so this is meant to be
+        submitted to RECORD_EXECUTOR while the response stream keeps flowing.
+    """
+    return append_description_to_record(append_image_to_record(record))
@@ -15,10 +15,13 @@ Functions:
     process_utterance: Processes a single user utterance and generates response
     lambda_handler: AWS Lambda entry point that handles incoming WebSocket messages
     process_response_stream: Processes streaming responses from Amazon Bedrock model
+    send_pending_responses: Sends queued responses to the client in order
 """
 
 import json
 import logging
+from collections import deque
+from concurrent.futures import Future
 from typing import Tuple
 from aws_bedrock import invoke_model_with_response_stream
 from aws_dynamodb import dynamodb_update_item_data, get_item_data
@@ -26,8 +29,7 @@ from aws_websocket import websocket_send_message
 from helper_prompt import generate_prompt, check_history_for_relevancy
 from helper_record import remove_empty_tag, is_full_record, \
     is_full_unclosed_record, fix_unclosed_record, separate_record, \
-    append_description_to_record, append_image_to_record, \
-    is_full_answer, separate_answer
+    enrich_record, is_full_answer, separate_answer, RECORD_EXECUTOR
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -141,8 +143,8 @@ def process_response_stream(
         1. Invokes Bedrock model with the question and relevant history
         2. Processes streaming response chunks from model
         3. Handles different response formats (answers, records, unclosed records)
-        4. Appends images and descriptions where needed
-        5. Sends formatted chunks back to client via WebSocket
+        4. Appends images and descriptions concurrently where needed
+        5. Sends formatted chunks back to client via WebSocket in order
         6. Updates conversation history with new exchange
 
     Example:
@@ -156,6 +158,8 @@ def process_response_stream(
     logging.info('Question: %s', question)
     answer = ''
     answer_chunk = ''
+    # Outbound text and in-flight record enrichments, in display order
+    pending = deque()
 
     streaming_response = invoke_model_with_response_stream(
         prompt=generate_prompt(
@@ -172,55 +176,26 @@ def process_response_stream(
                     answer_chunk, remainder = separate_answer(answer_chunk)
                     answer += answer_chunk
                     if chunking:
-                        websocket_send_message(
-                            connection_id=connection_id,
-                            message={
-                                'action': 'DISPLAY_RESPONSE',
-                                'value': remove_empty_tag(answer_chunk),
-                                'type': 'TEXT'
-                            }
-                        )
-                        logging.info('is_balanced_tag: %s',
-                                     remove_empty_tag(answer_chunk))
+                        pending.append(answer_chunk)
                         answer_chunk = remainder
                 elif is_full_record(answer_chunk):
                     answer_chunk, remainder = separate_record(answer_chunk)
                     answer += answer_chunk
-                    answer_chunk = append_image_to_record(answer_chunk)
-                    answer_chunk = append_description_to_record(
-                        answer_chunk)
                     if chunking:
-                        websocket_send_message(
-                            connection_id=connection_id,
-                            message={
-                                'action': 'DISPLAY_RESPONSE',
-                                'value': remove_empty_tag(answer_chunk),
-                                'type': 'TEXT'
-                            }
-                        )
-                        logging.info('is_balanced_tag: %s',
-                                     remove_empty_tag(answer_chunk))
+                        pending.append(RECORD_EXECUTOR.submit(
+                            enrich_record, answer_chunk))
                         answer_chunk = remainder
                 elif is_full_unclosed_record(answer_chunk):
                     answer_chunk = fix_unclosed_record(answer_chunk)
                     answer_chunk, remainder = separate_record(answer_chunk)
                     answer += answer_chunk
-                    answer_chunk = append_image_to_record(answer_chunk)
-                    answer_chunk = append_description_to_record(
-                        answer_chunk)
                     if chunking:
-                        websocket_send_message(
-                            connection_id=connection_id,
-                            message={
-                                'action': 'DISPLAY_RESPONSE',
-                                'value': remove_empty_tag(answer_chunk),
-                                'type': 'TEXT'
-                            }
-                        )
-                        logging.info('is_full_unclosed_record: %s',
-                                     remove_empty_tag(answer_chunk))
+                        pending.append(RECORD_EXECUTOR.submit(
+                            enrich_record, answer_chunk))
                         answer_chunk = remainder
+                send_pending_responses(connection_id, pending)
 
+    send_pending_responses(connection_id, pending, wait=True)
     if not stream or answer_chunk:
         answer += answer_chunk
         if not chunking:
@@ -235,8 +210,7 @@ def process_response_stream(
         else:
             answer_chunk = fix_unclosed_record(answer_chunk, is_last=True)
             answer_chunk, remainder = separate_record(answer_chunk)
-            answer_chunk = append_image_to_record(answer_chunk)
-            answer_chunk = append_description_to_record(answer_chunk)
+            answer_chunk = enrich_record(answer_chunk)
             websocket_send_message(
                 connection_id=connection_id,
                 message={
@@ -257,3 +231,34 @@ def process_response_stream(
     history.append({'User': question, 'Assistant': answer})
 
     return answer, history
+
+
+def send_pending_responses(connection_id: str, pending: deque, wait: bool = False) -> None:
+    """
+    Send queued responses to the client in order as soon as they are ready.
+
+    Args:
+        connection_id: WebSocket connection ID for the client
+        pending: Queue of response text and futures of enriched records
+        wait: Whether to block until every queued response has been sent
+
+    Returns:
+        None
+    """
+    while pending:
+        value = pending[0]
+        if isinstance(value, Future):
+            if not wait and not value.done():
+                return
+            value = value.result()
+        pending.popleft()
+        value = remove_empty_tag(value)
+        websocket_send_message(
+            connection_id=connection_id,
+            message={
+                'action': 'DISPLAY_RESPONSE',
+                'value': value,
+                'type': 'TEXT'
+            }
+        )
+        logging.info('Display response: %s', value)
@@ -4,32 +4,142 @@ WebSocket handler Lambda function for managing real-time communications.
 This module handles WebSocket connections and messages for a service integrating
 with Amazon Transcribe. It manages connection lifecycle, processes user utterances,
 and coordinates with other AWS services including CloudWatch, DynamoDB, and SQS.
+Metrics are written to the function log in the CloudWatch Embedded Metric Format.
 """
 
-import datetime
-import json
+import functools
+import itertools
 import logging
 import os
+import secrets
+import threading
 import time
-import uuid
-import boto3
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 from sigv4_presigned_url import generate_transcribestreaming_presigned_url
 
 
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger.setLevel(os.getenv('LOG_LEVEL', 'INFO'))
 
 AWS_REGION = os.environ['AWS_REGION']
 CLOUDWATCH_NAMESPACE = 'MOVIE_SEARCH_VOICE_CHATBOT'
 DYNAMODB_TABLE = os.environ['DYNAMODB_TABLE']
 UTTERANCE_QUEUE_FIFO_URL = os.environ['UTTERANCE_QUEUE_FIFO_URL']
 
-CLOUDWATCH_CLIENT = boto3.client('cloudwatch')
-DYNAMODB_CLIENT = boto3.client('dynamodb')
-SQS_CLIENT = boto3.client('sqs')
+# SendMessageBatch accepts at most ten entries per call
+SQS_BATCH_SIZE = 10
+
+# Deduplication ids are unique per container without reading the clock on every send,
+# the random part keeps containers sharing a PID from colliding
+CONTAINER_ID = secrets.token_hex(8)
+MESSAGE_COUNTER = itertools.count()
+
+# Serializes client creation, the default boto3 session is not thread safe
+CLIENT_LOCK = threading.Lock()
+
+# Reused across warm invocations to fan out independent AWS calls
+EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
+# Constant responses, serialized once at import
+RESPONSE_NO_REQUEST_CONTEXT = {
+    'statusCode': 400,
+    'body': orjson.dumps({
+        'action': 'ERROR',
+        'value': 'no request context found',
+        'type': 'TEXT'
+    }).decode()
+}
+RESPONSE_NO_CONNECTION_ID = {
+    'statusCode': 400,
+    'body': orjson.dumps({
+        'action': 'ERROR',
+        'value': 'no connection id found',
+        'type': 'TEXT'
+    }).decode()
+}
+RESPONSE_NO_ROUTE_KEY = {
+    'statusCode': 400,
+    'body': orjson.dumps({
+        'action': 'ERROR',
+        'value': 'no route key found',
+        'type': 'TEXT'
+    }).decode()
+}
+RESPONSE_NO_BODY = {
+    'statusCode': 400,
+    'body': orjson.dumps({
+        'action': 'ERROR',
+        'value': 'no body found',
+        'type': 'TEXT'
+    }).decode()
+}
+RESPONSE_NO_UTTERANCE = {
+    'statusCode': 400,
+    'body': orjson.dumps({
+        'action': 'ERROR',
+        'value': 'no utterance found',
+        'type': 'TEXT'
+    }).decode()
+}
+RESPONSE_TOO_MANY_UTTERANCES = {
+    'statusCode': 400,
+    'body': orjson.dumps({
+        'action': 'ERROR',
+        'value': 'too many utterances',
+        'type': 'TEXT'
+    }).decode()
+}
+RESPONSE_PONG = {
+    'statusCode': 200,
+    'body': orjson.dumps({
+        'action': 'PONG',
+        'value': 'PONG',
+        'type': 'PONG'
+    }).decode()
+}
+RESPONSE_DEFAULT = {
+    'statusCode': 200,
+    'body': orjson.dumps({
+        'action': 'INFO',
+        'value': 'Hello world from Websocket Lambda!',
+        'type': 'TEXT'
+    }).decode()
+}
+
+
+@functools.cache
+def get_client(service_name: str):
+    """
+    Create a boto3 client on first use and reuse it across warm invocations.
 
+    Args:
+        service_name (str): Name of the AWS service, e.g. 'dynamodb'
 
-def cloudwatch_put_metric(metric_name: str, value: float = 1.0, dimensions: list = []) -> None:
+    Returns:
+        BaseClient: boto3 client with TCP keep-alive and standard retries
+
+    Note:
+        boto3 is imported here rather than at module level so that routes
+        making no AWS calls, such as ping, do not pay the SDK import and
+        service model parsing cost during cold start.
+    """
+    import boto3
+    from botocore.config import Config
+    with CLIENT_LOCK:
+        # Keep connections alive so warm invocations skip the TCP and TLS handshakes
+        return boto3.client(service_name, config=Config(
+            tcp_keepalive=True,
+            retries={'max_attempts': 3, 'mode': 'standard'}))
+
+
+def cloudwatch_put_metric(
+    metric_name: str,
+    value: float = 1.0,
+    dimensions: list = [],
+    now: float = None,
+    rollup: bool = False
+) -> None:
     """
     Put a metric data point to CloudWatch.
 
@@ -37,26 +147,51 @@ def cloudwatch_put_metric(metric_name: str, value: float = 1.0, dimensions: list
         metric_name (str): Name of the metric to record
         value (float, optional): Value for the metric. Defaults to 1.0
         dimensions (list, optional): List of dimension dictionaries. Defaults to []
+        now (float, optional): Unix time of the data point. Defaults to the current time
+        rollup (bool, optional): Also publish the value without dimensions. Defaults to False
 
     Returns:
         None
-    """
-    CLOUDWATCH_CLIENT.put_metric_data(
-        Namespace=CLOUDWATCH_NAMESPACE,
-        MetricData=[
-            {
-                'MetricName': metric_name,
-                'Dimensions': dimensions,
-                'Timestamp': datetime.datetime.now(datetime.timezone.utc),
-                'Value': value,
-                'Unit': 'Count',
-                'StorageResolution': 60,
-            },
-        ]
-    )
-
 
-def dynamodb_put_item(connection_id: str, timestamp: int, data: dict = None) -> None:
+    Note:
+        The data point is printed as an Embedded Metric Format log line, which
+        CloudWatch Logs turns into a metric asynchronously. This avoids a
+        PutMetricData round-trip on the request path. A rollup adds an empty
+        dimension set to the same line rather than printing a second one.
+    """
+    if now is None:
+        now = time.time()
+    dimension_sets = [[dimension['Name'] for dimension in dimensions]]
+    if rollup and dimensions:
+        dimension_sets.insert(0, [])
+    print(orjson.dumps({
+        '_aws': {
+            'Timestamp': int(now * 1000),
+            'CloudWatchMetrics': [
+                {
+                    'Namespace': CLOUDWATCH_NAMESPACE,
+                    'Dimensions': dimension_sets,
+                    'Metrics': [
+                        {
+                            'Name': metric_name,
+                            'Unit': 'Count',
+                            'StorageResolution': 60,
+                        },
+                    ],
+                },
+            ],
+        },
+        metric_name: value,
+        **{dimension['Name']: dimension['Value'] for dimension in dimensions},
+    }).decode())
+
+
+def dynamodb_put_item(
+    connection_id: str,
+    timestamp: int,
+    data: dict = None,
+    now: float = None
+) -> None:
     """
     Store an item in DynamoDB with connection details and optional data.
 
@@ -64,20 +199,28 @@ def dynamodb_put_item(connection_id: str, timestamp: int, data: dict = None) ->
         connection_id (str): WebSocket connection identifier
         timestamp (int): Unix timestamp for the record
         data (dict, optional): Additional data to store. Defaults to None
+        now (float, optional): Unix time the ISO timestamp and TTL are derived
+            from. Defaults to the current time
 
     Returns:
         None
     """
     if data is None:
         data = {}
-    DYNAMODB_CLIENT.put_item(
+    if now is None:
+        now = time.time()
+    utc = time.gmtime(now)
+    timestamp_iso = '%04d-%02d-%02dT%02d:%02d:%02d.%06dZ' % (
+        utc.tm_year, utc.tm_mon, utc.tm_mday,
+        utc.tm_hour, utc.tm_min, utc.tm_sec, int(now % 1 * 1000000))
+    get_client('dynamodb').put_item(
         TableName=DYNAMODB_TABLE,
         Item={
             'connectionId': {'S': connection_id},
             'timestamp': {'N': str(timestamp)},
-            'timestamp_iso': {'S': datetime.datetime.now().isoformat()},
-            'data': {'S': json.dumps(data)},
-            'ttl': {'N': str(int(time.time()) + 86400)},
+            'timestamp_iso': {'S': timestamp_iso},
+            'data': {'S': orjson.dumps(data).decode()},
+            'ttl': {'N': str(int(now) + 86400)},
         }
     )
 
@@ -96,176 +239,194 @@ def sqs_put_message(queue_url: str, connection_id: str, message_body: dict = Non
     """
     if message_body is None:
         message_body = {}
-    SQS_CLIENT.send_message(
+    get_client('sqs').send_message(
         QueueUrl=queue_url,
-        MessageBody=json.dumps(message_body),
+        MessageBody=orjson.dumps(message_body).decode(),
         MessageGroupId=connection_id,
-        MessageDeduplicationId=str(uuid.uuid4()),
+        # Unique per connection within the five minute deduplication window
+        MessageDeduplicationId=f'{connection_id}:{CONTAINER_ID}:{next(MESSAGE_COUNTER)}',
     )
 
 
-def lambda_handler(event, _) -> dict:
+def sqs_put_messages(queue_url: str, connection_id: str, message_bodies: list) -> None:
     """
-    AWS Lambda handler for WebSocket connections and messages.
-
-    Handles various WebSocket routes including:
-    - $connect: New WebSocket connections
-    - $disconnect: Connection termination
-    - ping: Connection health check
-    - startProcess: Initiates processing with Transcribe
-    - sendUtterance: Handles user utterances
+    Send up to ten messages to an SQS FIFO queue in a single call.
 
     Args:
-        event: AWS Lambda event object containing WebSocket details
-        _: AWS Lambda context object (unused)
+        queue_url (str): URL of the SQS queue
+        connection_id (str): WebSocket connection identifier used as MessageGroupId
+        message_bodies (list): Message contents to send in order, at most SQS_BATCH_SIZE
 
     Returns:
-        dict: Response object with statusCode and body
+        None
+
+    Raises:
+        RuntimeError: If SQS rejects any entry of the batch
+
+    Note:
+        The messages share the connection's message group, so the queue keeps them
+        in order. A partial failure raises rather than resending, as a resend could
+        reorder the group.
     """
-    logging.info(event)
-
-    if 'requestContext' not in event:
-        return {
-            'statusCode': 400,
-            'body': json.dumps({
-                'action': 'ERROR',
-                'value': 'no request context found',
-                'type': 'TEXT'
-            })
-        }
-    request_context = event['requestContext']
-    if 'connectionId' not in request_context:
-        return {
-            'statusCode': 400,
-            'body': json.dumps({
-                'action': 'ERROR',
-                'value': 'no connection id found',
-                'type': 'TEXT'
-            })
-        }
-    connection_id = request_context['connectionId']
-    if 'routeKey' not in request_context:
-        return {
-            'statusCode': 400,
-            'body': json.dumps({
-                'action': 'ERROR',
-                'value': 'no route key found',
-                'type': 'TEXT'
-            })
-        }
-    route_key = request_context['routeKey']
+    response = get_client('sqs').send_message_batch(
+        QueueUrl=queue_url,
+        Entries=[
+            {
+                'Id': str(index),
+                'MessageBody': orjson.dumps(message_body).decode(),
+                'MessageGroupId': connection_id,
+                'MessageDeduplicationId': f'{connection_id}:{CONTAINER_ID}:{next(MESSAGE_COUNTER)}',
+            }
+            for index, message_body in enumerate(message_bodies)
+        ],
+    )
+    if response.get('Failed'):
+        logging.error('SQS batch failures: %s', response['Failed'])
+        raise RuntimeError(f"SQS batch failures: {response['Failed']}")
 
-    if route_key == '$connect':
-        # NO bidirectional response
-        # Handle new connection
-        cloudwatch_put_metric(
-            metric_name='WEBSOCKET_CONNECTION',
-        )
-        try:
-            dimensions = []
-            dimensions.append(
-                {
-                    'Name': 'userAgent',
-                    'Value': request_context['identity']['userAgent']
-                }
-            )
-            dimensions.append(
-                {
-                    'Name': 'sourceIp',
-                    'Value': request_context['identity']['sourceIp']
-                }
-            )
-            cloudwatch_put_metric(
-                metric_name='WEBSOCKET_CONNECTION',
-                dimensions=dimensions
-            )
-        except Exception:
-            pass
-
-    elif route_key == '$disconnect':
-        # NO bidirectional response
-        # Handle disconnection
-        pass
-
-    elif route_key == 'ping':
-        return {
-            'statusCode': 200,
-            'body': json.dumps({
-                'action': 'PONG',
-                'value': 'PONG',
-                'type': 'PONG'
-            })
-        }
 
-    elif route_key == 'startProcess':
-        # accepts bidirectional response
-        body = {}
-        if 'body' in event:
-            body = json.loads(event['body'])
-
-        controls = {}
-        if 'controls' in body:
-            controls = json.loads(body['controls'])
-
-        language_code = 'en-US'
-        if 'languageCode' in controls:
-            language_code = controls['languageCode']
-
-        presigned_url = generate_transcribestreaming_presigned_url(
-            region=AWS_REGION,
-            language_code=language_code,
-            sample_rate=16000,
-            expires=60,
-            encoding='pcm'
+def handle_connect(event: dict, connection_id: str, request_context: dict) -> dict:
+    """
+    Record metrics for a new WebSocket connection.
+
+    Args:
+        event (dict): AWS Lambda event object containing WebSocket details
+        connection_id (str): WebSocket connection identifier
+        request_context (dict): Request context of the event
+
+    Returns:
+        dict: None, the default response is sent
+    """
+    # NO bidirectional response
+    try:
+        dimensions = []
+        dimensions.append(
+            {
+                'Name': 'userAgent',
+                'Value': request_context['identity']['userAgent']
+            }
         )
-        dynamodb_put_item(
+        dimensions.append(
+            {
+                'Name': 'sourceIp',
+                'Value': request_context['identity']['sourceIp']
+            }
+        )
+    except Exception:
+        dimensions = []
+    # One log line publishes both the total and the per client data point
+    cloudwatch_put_metric(
+        metric_name='WEBSOCKET_CONNECTION',
+        dimensions=dimensions,
+        rollup=True,
+    )
+    return None
+
+
+def handle_ping(event: dict, connection_id: str, request_context: dict) -> dict:
+    """
+    Answer a connection health check.
+
+    Args:
+        event (dict): AWS Lambda event object containing WebSocket details
+        connection_id (str): WebSocket connection identifier
+        request_context (dict): Request context of the event
+
+    Returns:
+        dict: Response object with a PONG body
+    """
+    return RESPONSE_PONG
+
+
+def handle_start_process(event: dict, connection_id: str, request_context: dict) -> dict:
+    """
+    Store the session controls and return a presigned Transcribe streaming URL.
+
+    Args:
+        event (dict): AWS Lambda event object containing WebSocket details
+        connection_id (str): WebSocket connection identifier
+        request_context (dict): Request context of the event
+
+    Returns:
+        dict: Response object with the presigned Transcribe URL
+    """
+    # accepts bidirectional response
+    now = time.time()
+    body = {}
+    if 'body' in event:
+        body = orjson.loads(event['body'])
+
+    controls = body.get('controls') or {}
+    # Older clients send the controls JSON encoded as a string
+    if isinstance(controls, str):
+        controls = orjson.loads(controls)
+
+    language_code = 'en-US'
+    if 'languageCode' in controls:
+        language_code = controls['languageCode']
+
+    # The table write and queue message are independent, so they run
+    # concurrently while the presigned URL is signed locally
+    futures = [
+        EXECUTOR.submit(
+            dynamodb_put_item,
             connection_id=connection_id,
-            timestamp=int(time.time()),
+            timestamp=int(now),
             data={
                 'controls': controls
             },
-        )
-        sqs_put_message(
+            now=now,
+        ),
+        EXECUTOR.submit(
+            sqs_put_message,
             queue_url=UTTERANCE_QUEUE_FIFO_URL,
             connection_id=connection_id,
             message_body={
                 'connectionId': connection_id,
                 'action': 'CREATE_SCENARIO'
             }
-        )
-        cloudwatch_put_metric(
-            metric_name='TRANSCRIBE_CONNECTION',
-        )
-        return {
-            'statusCode': 200,
-            'body': json.dumps({
-                'action': 'TRANSCRIBE_CONNECTION',
-                'value': presigned_url,
-                'type': 'URL'
-            })
-        }
+        ),
+    ]
+    presigned_url = generate_transcribestreaming_presigned_url(
+        region=AWS_REGION,
+        language_code=language_code,
+        sample_rate=16000,
+        expires=60,
+        encoding='pcm'
+    )
+    for future in futures:
+        future.result()
+    cloudwatch_put_metric(
+        metric_name='TRANSCRIBE_CONNECTION',
+        now=now,
+    )
+    return {
+        'statusCode': 200,
+        'body': orjson.dumps({
+            'action': 'TRANSCRIBE_CONNECTION',
+            'value': presigned_url,
+            'type': 'URL'
+        }).decode()
+    }
 
-    elif route_key == 'sendUtterance':
-        # NO bidirectional response
-        if 'body' not in event:
-            return {
-                'statusCode': 400,
-                'body': json.dumps({
-                    'action': 'ERROR',
-                    'value': 'no body found',
-                    'type': 'TEXT'
-                })
-            }
-        body = json.loads(event['body'])
-        if 'utterance' not in body:
-            return {
-                'statusCode': 400,
-                'body': json.dumps({
-                    'action': 'ERROR',
-                    'value': 'no utterance found',
-                    'type': 'TEXT'
-                })
-            }
+
+def handle_send_utterance(event: dict, connection_id: str, request_context: dict) -> dict:
+    """
+    Queue a user utterance for the utterance handler.
+
+    Args:
+        event (dict): AWS Lambda event object containing WebSocket details
+        connection_id (str): WebSocket connection identifier
+        request_context (dict): Request context of the event
+
+    Returns:
+        dict: Error response if the body or utterance is missing, otherwise None
+    """
+    # NO bidirectional response
+    if 'body' not in event:
+        return RESPONSE_NO_BODY
+    body = orjson.loads(event['body'])
+    if 'utterance' in body:
         utterance = body['utterance']
         sqs_put_message(
             queue_url=UTTERANCE_QUEUE_FIFO_URL,
@@ -278,17 +439,91 @@ def lambda_handler(event, _) -> dict:
         cloudwatch_put_metric(
             metric_name='UTTERANCE_RECEIVED',
         )
+        return None
+    # Utterances coalesced by the client are queued together
+    utterances = body.get('utterances')
+    if not utterances or not isinstance(utterances, list) or \
+            not all(isinstance(utterance, str) for utterance in utterances):
+        return RESPONSE_NO_UTTERANCE
+    # One batch at most, so a failure never leaves part of the list queued
+    if len(utterances) > SQS_BATCH_SIZE:
+        return RESPONSE_TOO_MANY_UTTERANCES
+    sqs_put_messages(
+        queue_url=UTTERANCE_QUEUE_FIFO_URL,
+        connection_id=connection_id,
+        message_bodies=[
+            {
+                'connectionId': connection_id,
+                'utterance': utterance
+            }
+            for utterance in utterances
+        ]
+    )
+    cloudwatch_put_metric(
+        metric_name='UTTERANCE_RECEIVED',
+        value=float(len(utterances)),
+    )
+    return None
 
-    else:
-        # NO bidirectional response
-        # Handle other route keys
-        pass
 
-    return {
-        'statusCode': 200,
-        'body': json.dumps({
-            'action': 'INFO',
-            'value': 'Hello world from Websocket Lambda!',
-            'type': 'TEXT'
-        })
-    }
+def handle_default(event: dict, connection_id: str, request_context: dict) -> dict:
+    """
+    Handle $disconnect and any other route key without a dedicated handler.
+
+    Args:
+        event (dict): AWS Lambda event object containing WebSocket details
+        connection_id (str): WebSocket connection identifier
+        request_context (dict): Request context of the event
+
+    Returns:
+        dict: None, the default response is sent
+    """
+    # NO bidirectional response
+    return None
+
+
+ROUTES = {
+    '$connect': handle_connect,
+    'ping': handle_ping,
+    'startProcess': handle_start_process,
+    'sendUtterance': handle_send_utterance,
+}
+
+
+def lambda_handler(event, _) -> dict:
+    """
+    AWS Lambda handler for WebSocket connections and messages.
+
+    Handles various WebSocket routes including:
+    - $connect: New WebSocket connections
+    - $disconnect: Connection termination
+    - ping: Connection health check
+    - startProcess: Initiates processing with Transcribe
+    - sendUtterance: Handles user utterances
+
+    Args:
+        event: AWS Lambda event object containing WebSocket details
+        _: AWS Lambda context object (unused)
+
+    Returns:
+        dict: Response object with statusCode and body
+    """
+    # Formatted only when LOG_LEVEL enables debug output
+    logger.debug('Event: %s', event)
+
+    request_context = event.get('requestContext')
+    if request_context is None:
+        return RESPONSE_NO_REQUEST_CONTEXT
+    connection_id = request_context.get('connectionId')
+    if connection_id is None:
+        return RESPONSE_NO_CONNECTION_ID
+    route_key = request_context.get('routeKey')
+    if route_key is None:
+        return RESPONSE_NO_ROUTE_KEY
+
+    response = ROUTES.get(route_key, handle_default)(
+        event, connection_id, request_context)
+    if response:
+        return response
+
+    return RESPONSE_DEFAULT